@@ -14,20 +14,21 @@ def upsert_env_variables(file_path: str, updates: dict[str, str]) -> None:
     new_lines = []
 
     for line in original_lines:
-        updated = False
-        for key, value in updates.items():
-            if line.startswith(f"{key}="):
-                new_lines.append(f"{key}={value}")
-                replaced_keys.add(key)
-                updated = True
-                break
-        if not updated:
+        key, sep, _ = line.partition("=")
+        if sep and key in updates:
+            new_lines.append(f"{key}={updates[key]}")
+            replaced_keys.add(key)
+        else:
             new_lines.append(line)
 
     for key, value in updates.items():
         if key not in replaced_keys:
             new_lines.append(f"{key}={value}")
 
+    # Re-running with values that are already in place leaves the file untouched
+    if new_lines == original_lines:
+        return
+
     with open(file_path, "w") as env_file:
         env_file.write("\n".join(new_lines) + "\n")
 
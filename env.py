@@ -7,9 +7,14 @@ This environment provides tools for:
 Tools prefixed with _ are internal (hidden from agent, used by scenarios).
 """
 
+import asyncio
+import functools
+import json
 import logging
 import os
-import subprocess
+import pwd
+import shutil
+import stat
 from pathlib import Path
 
 from hud import Environment
@@ -26,9 +31,13 @@ env = Environment("coding")
 _bash_tool: BashTool | None = None
 _edit_tool: EditTool | None = None
 
+# Patches generated in this process, keyed by (base, ref) commit SHA pair
+_generated_patches: dict[tuple[str, str], str] = {}
 
+
+@functools.cache
 def _get_project_dir() -> str:
-    """Get the project directory path."""
+    """Get the project directory path (resolved once from the environment)."""
     return os.getenv("PROJECT_DIR", f"/home/ubuntu/{os.environ.get('FOLDER_NAME', 'project')}")
 
 
@@ -38,7 +47,9 @@ async def initialize() -> None:
     global _bash_tool, _edit_tool
 
     logger.info("Initializing coding environment")
-    _bash_tool = BashTool()
+    # The agent's shell starts in the project; setup never changes the server's cwd
+    project_dir = _get_project_dir()
+    _bash_tool = BashTool(cwd=project_dir if os.path.isdir(project_dir) else None)
     _edit_tool = EditTool()
     logger.info("Coding environment initialized")
 
@@ -137,7 +148,85 @@ async def editor(
 # ============================================================================
 
 
-def setup_task(task_id: str, base: str, test: str, golden: str, validate_mode: ValidateMode | None = None) -> None:
+def _copy_atomic(src: str, dst: str) -> None:
+    """Copy src to dst so that dst is never observed half-written."""
+    shutil.copyfile(src, f"{dst}.tmp")
+    os.replace(f"{dst}.tmp", dst)
+
+
+@functools.cache
+def _ubuntu_ids() -> tuple[int, int] | None:
+    """The ubuntu user's (uid, gid), or None if there is no such user."""
+    try:
+        user = pwd.getpwnam("ubuntu")
+    except KeyError:
+        return None
+    return user.pw_uid, user.pw_gid
+
+
+def _owned_by_ubuntu(path: str) -> bool:
+    """Whether path is owned by the ubuntu user (False if there is no such user)."""
+    ids = _ubuntu_ids()
+    try:
+        return ids is not None and os.stat(path).st_uid == ids[0]
+    except OSError:
+        return False
+
+
+def _chown_tree(root: str, uid: int, gid: int) -> None:
+    """Recursively chown root to uid:gid, skipping root/.git.
+
+    Entries that already have the right owner are not touched, so re-owning a
+    freshly checked-out tree only costs a stat per file. Symlinks are changed
+    themselves and never followed. Errors on individual entries are ignored.
+    """
+    git_dir = os.path.join(root, ".git")
+    stack = [root]
+    while stack:
+        path = stack.pop()
+        try:
+            st = os.lstat(path)
+        except OSError:
+            continue
+        if st.st_uid != uid or st.st_gid != gid:
+            try:
+                os.chown(path, uid, gid, follow_symlinks=False)
+            except OSError:
+                pass
+        if not stat.S_ISDIR(st.st_mode):
+            continue
+        try:
+            with os.scandir(path) as it:
+                entries = list(it)
+        except OSError:
+            continue
+        for entry in entries:
+            if entry.path == git_dir:
+                continue
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                    continue
+                est = entry.stat(follow_symlinks=False)
+                if est.st_uid != uid or est.st_gid != gid:
+                    os.chown(entry.path, uid, gid, follow_symlinks=False)
+            except OSError:
+                continue
+
+
+async def _worktree_is_clean(project_dir: str) -> bool:
+    """Whether tracked files in project_dir match HEAD."""
+    proc = await asyncio.create_subprocess_exec(
+        "git", "status", "--porcelain", "--untracked-files=no",
+        cwd=project_dir,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.DEVNULL,
+    )
+    stdout, _ = await proc.communicate()
+    return proc.returncode == 0 and not stdout.strip()
+
+
+async def setup_task(task_id: str, base: str, test: str, golden: str, validate_mode: ValidateMode | None = None) -> None:
     """Set up environment for a task: checkout baseline, generate patches.
     
     Args:
@@ -149,6 +238,10 @@ def setup_task(task_id: str, base: str, test: str, golden: str, validate_mode: V
     project_dir = _get_project_dir()
     patches_dir = os.environ.get("PATCHES_DIR", "/home/root/patches")
     
+    logger.info(
+        "setup_task id=%s base=%s test=%s golden=%s validate_mode=%s", task_id, base, test, golden, validate_mode
+    )
+
     # Set PROBLEM_ID env var for grading runner
     os.environ["PROBLEM_ID"] = task_id
     
@@ -156,58 +249,134 @@ def setup_task(task_id: str, base: str, test: str, golden: str, validate_mode: V
     task_patches_dir = os.path.join(patches_dir, task_id)
     os.makedirs(task_patches_dir, exist_ok=True)
     
-    # Generate test.patch (base → test)
-    logger.info("Generating test.patch: %s → %s", base, test)
-    result = subprocess.run(
-        ["git", "diff", f"origin/{base}", f"origin/{test}"],
+    # Resolve HEAD and every branch to a commit with a single rev-parse; the
+    # diffs and checkout below work on the SHAs directly.
+    branches = list(dict.fromkeys((base, test, golden)))
+    proc = await asyncio.create_subprocess_exec(
+        "git", "rev-parse", "HEAD", *(f"origin/{branch}" for branch in branches),
         cwd=project_dir,
-        capture_output=True,
-        text=True,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
     )
-    with open(os.path.join(task_patches_dir, "test.patch"), "w") as f:
-        f.write(result.stdout)
-    
-    # Generate golden.patch (base → golden)
-    logger.info("Generating golden.patch: %s → %s", base, golden)
-    result = subprocess.run(
-        ["git", "diff", f"origin/{base}", f"origin/{golden}"],
-        cwd=project_dir,
-        capture_output=True,
-        text=True,
-    )
-    with open(os.path.join(task_patches_dir, "golden.patch"), "w") as f:
-        f.write(result.stdout)
-    
-    # Checkout baseline branch
-    if validate_mode == "golden_pass":
-        logger.info("Checking out golden branch (validation): %s", golden)
-        checkout_branch = golden
+    stdout, stderr = await proc.communicate()
+    resolved = proc.returncode == 0
+    if not resolved:
+        logger.error("Failed to resolve branches %s: %s", branches, stderr.decode(errors="replace"))
+        head = None
+        shas = {branch: f"origin/{branch}" for branch in branches}
     else:
-        checkout_branch = base
-        logger.info("Checking out baseline branch: %s", checkout_branch)
-
-    result = subprocess.run(
-        ["git", "checkout", "-f", f"origin/{checkout_branch}"],
-        cwd=project_dir,
-        capture_output=True,
-        text=True,
-    )
-    if result.returncode != 0:
-        logger.error("Failed to checkout %s: %s", checkout_branch, result.stderr)
+        head, *branch_shas = stdout.decode().split()
+        shas = dict(zip(branches, branch_shas, strict=True))
+
+    # Generate test.patch (base → test) and golden.patch (base → golden).
+    # manifest.json records the commit pair each patch was generated from, so
+    # patches whose commits have not moved are left alone. Each remaining commit
+    # pair is diffed once; tasks that share a pair reuse the patch generated
+    # earlier in this process. The diffs only read committed trees, so they run
+    # side by side.
+    manifest_path = os.path.join(task_patches_dir, "manifest.json")
+    try:
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        manifest = {}
+
+    targets: dict[tuple[str, str], list[str]] = {}
+    for name, ref in (("test.patch", test), ("golden.patch", golden)):
+        pair = (shas[base], shas[ref])
+        path = os.path.join(task_patches_dir, name)
+        if resolved and manifest.get(name) == list(pair) and os.path.exists(path):
+            logger.debug("%s is up to date (%s..%s)", name, *pair)
+            _generated_patches.setdefault(pair, path)
+            continue
+        targets.setdefault(pair, []).append(path)
+
+    diffs = {}
+    for pair, paths in targets.items():
+        cached = _generated_patches.get(pair)
+        if cached and os.path.exists(cached):
+            logger.debug("Reusing patch for %s..%s from %s", *pair, cached)
+            for path in paths:
+                if path != cached:
+                    _copy_atomic(cached, path)
+            continue
+        logger.debug("Generating %s: %s..%s", paths, *pair)
+        # git writes straight into a temporary file next to the patch, which
+        # replaces the patch only once the diff has succeeded
+        with open(f"{paths[0]}.tmp", "wb") as f:
+            diffs[pair] = await asyncio.create_subprocess_exec(
+                "git", "diff-tree", "-p", "--binary", "--no-color", "--no-ext-diff", "--no-textconv", "--no-renames",
+                *pair,
+                cwd=project_dir,
+                stdout=f,
+                stderr=asyncio.subprocess.DEVNULL,
+            )
+    await asyncio.gather(*(proc.wait() for proc in diffs.values()))
+    for pair, proc in diffs.items():
+        first, *rest = targets[pair]
+        if proc.returncode != 0:
+            logger.error("git diff-tree %s..%s failed with exit code %d", *pair, proc.returncode)
+            os.remove(f"{first}.tmp")
+            targets.pop(pair)
+            continue
+        os.replace(f"{first}.tmp", first)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Wrote %s (%d bytes)", first, os.path.getsize(first))
+        for path in rest:
+            _copy_atomic(first, path)
+        _generated_patches[pair] = first
+
+    if resolved and targets:
+        for pair, paths in targets.items():
+            for path in paths:
+                manifest[os.path.basename(path)] = list(pair)
+        with open(f"{manifest_path}.tmp", "w") as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(f"{manifest_path}.tmp", manifest_path)
+
+    # Checkout baseline branch (golden when validating that the solution passes)
+    checkout_branch = golden if validate_mode == "golden_pass" else base
+
+    if head == shas[checkout_branch] and _owned_by_ubuntu(project_dir) and await _worktree_is_clean(project_dir):
+        # Re-running setup on an untouched checkout: nothing to check out or chown
+        logger.debug("%s is already checked out and clean", checkout_branch)
     else:
-        logger.info("Checked out baseline branch: %s", checkout_branch)
-        # Restore file ownership to ubuntu
-        subprocess.run(["chown", "-R", "ubuntu:ubuntu", project_dir], capture_output=True)
-        # Keep .git protected
-        subprocess.run(["chown", "-R", "root:root", os.path.join(project_dir, ".git")], capture_output=True)
-    
-    os.chdir(project_dir)
+        # Check out with one parallel checkout worker per CPU
+        proc = await asyncio.create_subprocess_exec(
+            "git", "-c", "checkout.workers=0", "checkout", "-f", shas[checkout_branch],
+            cwd=project_dir,
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        _, stderr = await proc.communicate()
+        if proc.returncode != 0:
+            logger.error("Failed to checkout %s: %s", checkout_branch, stderr.decode(errors="replace"))
+        else:
+            logger.debug("Checked out %s", checkout_branch)
+            # Restore file ownership to ubuntu; .git stays root-owned
+            ids = _ubuntu_ids()
+            if ids:
+                await asyncio.to_thread(_chown_tree, project_dir, *ids)
+
+    # A shell left over from a previous task goes back to the project directory
+    if _bash_tool is not None:
+        await _bash_tool.reset(cwd=project_dir)
+
+
+_PROMPT_TEMPLATE = """You will be working on a task for {folder_name}.
+The repository has already been cloned in /home/ubuntu/{folder_name}.
 
+Use the tools provided to complete the following task:
 
+{description}
+"""
 
 
+@functools.cache
 def make_prompt(description: str) -> str:
     """Generate a prompt from a task description.
+
+    Prompts are cached per description; FOLDER_NAME is fixed for the life of the container.
     
     Args:
         description: The task description
@@ -216,13 +385,7 @@ def make_prompt(description: str) -> str:
         Formatted prompt string
     """
     folder_name = os.environ.get('FOLDER_NAME', 'project')
-    return f"""You will be working on a task for {folder_name}.
-The repository has already been cloned in /home/ubuntu/{folder_name}.
-
-Use the tools provided to complete the following task:
-
-{description}
-"""
+    return _PROMPT_TEMPLATE.format(folder_name=folder_name, description=description)
 
 
 # ============================================================================
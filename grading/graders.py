@@ -11,14 +11,14 @@ class AgentPatchGrader(Grader):
     Grader that applies test.patch and runs tests.
     
     Usage:
-        AgentPatchGrader.grade(
+        await AgentPatchGrader.grade(
             weight=1.0,
             problem_id="my_task",
             test_files=["test_foo.py"],
         )
     
     Custom test command:
-        AgentPatchGrader.grade(
+        await AgentPatchGrader.grade(
             weight=1.0,
             problem_id="my_task",
             test_files=["test_foo.test.ts"],
@@ -30,7 +30,7 @@ class AgentPatchGrader(Grader):
     DEFAULT_TEST_COMMAND = "uv run pytest {test_files}"
 
     @classmethod
-    def compute_score(
+    async def compute_score(
         cls,
         test_files: list[str],
         problem_id: str | None = None,
@@ -59,7 +59,7 @@ class AgentPatchGrader(Grader):
             test_files=test_files,
         )
 
-        score = runner.grade()
+        score = await runner.grade()
 
         # when testing with baseline fail, we want to ensure that the baseline actually fails, so we invert the score
         if validate_mode == "baseline_fail":
@@ -8,6 +8,8 @@ Workflow:
    - Returns score (0.0 or 1.0)
 """
 
+import asyncio
+import inspect
 import logging
 import os
 import subprocess
@@ -26,14 +28,14 @@ class GradingRunner:
             test_command="pytest {test_files}",
             test_files=["test_foo.py"],
         )
-        score = runner.grade()
+        score = await runner.grade()
     
     To customize, override run_tests():
         
         class MyRunner(GradingRunner):
-            def run_tests(self) -> tuple[bool, dict]:
-                result = subprocess.run(["make", "test"], cwd=self.working_dir)
-                return result.returncode == 0, {}
+            async def run_tests(self) -> tuple[bool, dict]:
+                proc = await asyncio.create_subprocess_exec("make", "test", cwd=self.working_dir)
+                return await proc.wait() == 0, {}
     """
 
     def __init__(
@@ -55,7 +57,14 @@ class GradingRunner:
     def test_patch(self) -> str:
         return os.path.join(self.patches_dir, self.problem_id, "test.patch")
 
-    def grade(self) -> float:
+    @staticmethod
+    async def _check_call(*cmd: str, cwd: str | None = None) -> None:
+        """Run a command without blocking the event loop; raise CalledProcessError on failure."""
+        proc = await asyncio.create_subprocess_exec(*cmd, cwd=cwd)
+        if await proc.wait() != 0:
+            raise subprocess.CalledProcessError(proc.returncode, cmd)
+
+    async def grade(self) -> float:
         """
         Run grading and return score.
         
@@ -63,21 +72,18 @@ class GradingRunner:
             1.0 if tests pass, 0.0 otherwise
         """
         # Copy repo to grading workspace
-        logger.info(f"Copying repo to {self.working_dir}")
-        subprocess.run(["cp", "-rT", self.repo_path, self.working_dir], check=True)
+        logger.info("Copying repo to %s", self.working_dir)
+        await self._check_call("cp", "-rT", "--reflink=auto", self.repo_path, self.working_dir)
 
         # Apply test patch (adds test files)
-        logger.info(f"Applying test patch: {self.test_patch}")
-        with open(self.test_patch) as f:
-            subprocess.run(
-                ["git", "apply"],
-                cwd=self.working_dir,
-                input=f.read().encode(),
-                check=True,
-            )
+        logger.info("Applying test patch: %s", self.test_patch)
+        await self._check_call("git", "apply", "--whitespace=nowarn", self.test_patch, cwd=self.working_dir)
 
-        # Run tests
-        success, metadata = self.run_tests()
+        # Run tests (run_tests overrides may still be plain sync methods)
+        result = self.run_tests()
+        if inspect.isawaitable(result):
+            result = await result
+        success, metadata = result
         
         return 1.0 if success else 0.0
 
@@ -85,25 +91,27 @@ class GradingRunner:
     # CUSTOMIZE THIS
     # =========================================================================
 
-    def run_tests(self) -> tuple[bool, dict]:
+    async def run_tests(self) -> tuple[bool, dict]:
         """
-        Run tests and return results. Override this for custom logic.
+        Run tests and return results. Override this for custom logic;
+        a synchronous override is also accepted.
         
         Returns:
             (success, metadata) - success is True if tests pass
         """
         cmd = self.test_command.format(test_files=" ".join(self.test_files))
-        logger.info(f"Running: {cmd}")
+        logger.info("Running: %s", cmd)
         
-        result = subprocess.run(
-            ["bash", "-lc", cmd],
+        proc = await asyncio.create_subprocess_exec(
+            "bash", "-lc", cmd,
             cwd=self.working_dir,
-            capture_output=True,
-            text=True,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
         )
+        stdout, stderr = await proc.communicate()
 
-        return result.returncode == 0, {
-            "exit_code": result.returncode,
-            "stdout": result.stdout,
-            "stderr": result.stderr,
+        return proc.returncode == 0, {
+            "exit_code": proc.returncode,
+            "stdout": stdout.decode(errors="replace"),
+            "stderr": stderr.decode(errors="replace"),
         }
@@ -1,11 +1,13 @@
 """Grading specifications and types."""
 
+import inspect
 import logging
+import math
+from collections import Counter
+from collections.abc import Awaitable
 from dataclasses import dataclass, field
 from typing import Annotated, Any, Literal
 
-import numpy as np
-
 logger = logging.getLogger(__name__)
 
 ValidateMode = Literal["baseline_fail", "golden_pass"]
@@ -22,7 +24,7 @@ def validate_grader_name(name: str) -> str:
 GraderName = Annotated[str, "A grader name containing only letters, underscores, and hyphens"]
 
 
-@dataclass(kw_only=True, frozen=True)
+@dataclass(kw_only=True, frozen=True, slots=True)
 class SubGrade:
     name: GraderName
     score: float
@@ -34,7 +36,7 @@ class SubGrade:
         validate_grader_name(self.name)
 
 
-@dataclass(kw_only=True, frozen=True)
+@dataclass(kw_only=True, frozen=True, slots=True)
 class Grade:
     """The grade returned by a scenario."""
 
@@ -45,25 +47,23 @@ class Grade:
     @property
     def score(self):
         assert self.subscores.keys() == self.weights.keys()
-        assert np.isclose(sum(self.weights.values()), 1)
+        assert math.isclose(sum(self.weights.values()), 1, rel_tol=1e-5, abs_tol=1e-8)
         assert min(self.subscores.values()) >= 0
         assert max(self.subscores.values()) <= 1
 
         score = sum([self.subscores[key] * self.weights[key] for key in self.subscores.keys()])
-        return np.clip(score, 0.0, 1.0)
+        return min(max(score, 0.0), 1.0)
 
     @staticmethod
     def from_subscores(subscores: list[SubGrade]) -> "Grade":
         # First pass: count occurrences of each name
-        name_counts = {}
-        for subscore in subscores:
-            name_counts[subscore.name] = name_counts.get(subscore.name, 0) + 1
+        name_counts = Counter(subscore.name for subscore in subscores)
 
         # Second pass: assign final names
         subscores_dict = {}
         weights_dict = {}
         metadata_dict = {}
-        name_usage = {}
+        name_usage: Counter[str] = Counter()
 
         for subscore in subscores:
             original_name = subscore.name
@@ -71,10 +71,7 @@ class Grade:
             if name_counts[original_name] == 1:
                 final_name = original_name
             else:
-                if original_name not in name_usage:
-                    name_usage[original_name] = 1
-                else:
-                    name_usage[original_name] += 1
+                name_usage[original_name] += 1
                 final_name = f"{original_name}-{name_usage[original_name]}"
 
             subscores_dict[final_name] = subscore.score
@@ -90,9 +87,11 @@ class Grader:
     name: str = "BaseGrader"
 
     @classmethod
-    def grade(cls, weight: float, **kwargs) -> SubGrade:
-        """Grade and return a SubGrade."""
+    async def grade(cls, weight: float, **kwargs) -> SubGrade:
+        """Grade and return a SubGrade. compute_score may be sync or async."""
         result = cls.compute_score(**kwargs)
+        if inspect.isawaitable(result):
+            result = await result
 
         if isinstance(result, tuple):
             score, metadata = result
@@ -103,8 +102,10 @@ class Grader:
         return SubGrade(name=cls.name, score=score, weight=weight, parameters=kwargs, metadata=metadata)
 
     @classmethod
-    def compute_score(cls, **kwargs) -> float | tuple[float, dict[str, Any]]:
-        """Compute a score between 0.0 and 1.0 based on the current state."""
+    def compute_score(
+        cls, **kwargs
+    ) -> float | tuple[float, dict[str, Any]] | Awaitable[float | tuple[float, dict[str, Any]]]:
+        """Compute a score between 0.0 and 1.0 based on the current state; may be a coroutine."""
         raise NotImplementedError("Subclasses must implement compute_score")
 
     @classmethod
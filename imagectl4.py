@@ -10,18 +10,23 @@ Actions (flags can be combined, e.g. -bvr):
   -p/--push:      Push Docker image to registry
   -j/--json:      Generate problem-metadata.json
 
-Execution order: build -> validate -> run -> push -> json
+Execution order: build first, then validate, run, push and json run
+concurrently (--sequential runs them one after another in that order).
 
 Parallelism uses asyncio throughout. Validation and run tasks for
-different scenario IDs execute concurrently via asyncio.gather.
+different scenario IDs execute concurrently, bounded by --validate-concurrency
+and --run-concurrency, and report results as they complete. The two limits are
+separate, so with -vr up to their sum run at once unless --sequential is given.
 """
 
 from __future__ import annotations
 
 import argparse
 import asyncio
+import functools
 import json
 import logging
+import os
 import sys
 import tomllib
 from collections.abc import Iterable
@@ -31,6 +36,11 @@ import hud
 from hud import Environment
 from hud.agents.claude import ClaudeAgent
 
+try:
+    import orjson
+except ImportError:  # optional: faster JSON writes when installed
+    orjson = None
+
 logging.basicConfig(level=logging.INFO, format="[%(levelname)s] %(message)s")
 logger = logging.getLogger(__name__)
 
@@ -56,7 +66,7 @@ def read_image_from_pyproject() -> str | None:
             data = tomllib.load(f)
         return data.get("tool", {}).get("hud", {}).get("image")
     except Exception as exc:
-        logger.debug(f"Failed to read pyproject.toml: {exc}")
+        logger.debug("Failed to read pyproject.toml: %s", exc)
         return None
 
 
@@ -82,10 +92,18 @@ def discover_scenario_ids() -> list[str]:
     from env import env as _env  # noqa: WPS433 – intentional late import
 
     ids = list(_env._scenarios.keys())
-    logger.info(f"Auto-discovered {len(ids)} scenario(s): {ids}")
+    logger.info("Auto-discovered %d scenario(s): %s", len(ids), ids)
     return ids
 
 
+def read_ids_file(path: str) -> list[str]:
+    """Read scenario IDs from *path* ("-" for stdin), one per line; blank lines are skipped."""
+    if path == "-":
+        return [sid for sid in (line.strip() for line in sys.stdin) if sid]
+    with open(path, encoding="utf-8") as f:
+        return [sid for sid in (line.strip() for line in f) if sid]
+
+
 # ============================================================================
 # Subprocess helpers (async)
 # ============================================================================
@@ -99,9 +117,22 @@ async def run_subprocess(cmd: list[str], prefix: str) -> int:
         stderr=asyncio.subprocess.STDOUT,
     )
     assert process.stdout is not None
-    async for raw_line in process.stdout:
-        line = raw_line.decode(errors="replace")
-        sys.stdout.write(f"{prefix} {line}")
+    # Pass output through as bytes in 64 KiB chunks, inserting the prefix at
+    # line starts. Unlike line iteration, this has no per-line size limit.
+    prefix_bytes = f"{prefix} ".encode()
+    newline_prefixed = b"\n" + prefix_bytes
+    out = sys.stdout.buffer
+    at_line_start = True
+    while chunk := await process.stdout.read(65536):
+        if at_line_start:
+            out.write(prefix_bytes)
+        # A trailing newline's prefix is deferred until more output arrives.
+        at_line_start = chunk.endswith(b"\n")
+        body = chunk[:-1] if at_line_start else chunk
+        out.write(body.replace(b"\n", newline_prefixed))
+        if at_line_start:
+            out.write(b"\n")
+        out.flush()
     await process.wait()
     return process.returncode or 0
 
@@ -113,33 +144,51 @@ async def run_subprocess(cmd: list[str], prefix: str) -> int:
 
 async def build_image(image: str) -> bool:
     """Build a single Docker image via ``docker build -t <image> -f Dockerfile.hud .``."""
-    logger.info(f"Building image: {image}")
+    logger.info("Building image: %s", image)
     cmd = ["docker", "build", "-t", image, "-f", "Dockerfile.hud", "."]
     rc = await run_subprocess(cmd, prefix="[build]")
     if rc != 0:
-        logger.error(f"Build FAILED for {image} (exit code {rc})")
+        logger.error("Build FAILED for %s (exit code %d)", image, rc)
         return False
-    logger.info(f"Build succeeded for {image}")
+    logger.info("Build succeeded for %s", image)
     return True
 
 
 async def push_image(image: str) -> bool:
     """Push a single Docker image via ``docker push <image>``."""
-    logger.info(f"Pushing image: {image}")
+    logger.info("Pushing image: %s", image)
     cmd = ["docker", "push", image]
     rc = await run_subprocess(cmd, prefix="[push]")
     if rc != 0:
-        logger.error(f"Push FAILED for {image} (exit code {rc})")
+        logger.error("Push FAILED for %s (exit code %d)", image, rc)
         return False
-    logger.info(f"Push succeeded for {image}")
+    logger.info("Push succeeded for %s", image)
     return True
 
 
+# ============================================================================
+# Environment handles
+# ============================================================================
+
+
+@functools.cache
+def _environment_for(image: str) -> Environment:
+    """Return the shared client-side ``Environment`` connected to *image*.
+
+    Each eval starts its own container; the Environment only holds the
+    connection config, so one instance per image is reused across tasks.
+    """
+    env = Environment("coding")
+    env.connect_image(image)
+    return env
+
+
 # ============================================================================
 # Validate
 # ============================================================================
 
 VALIDATE_MODES = ("baseline_fail", "golden_pass")
+DEFAULT_VALIDATE_CONCURRENCY = 8
 
 
 async def validate_scenario(
@@ -158,11 +207,9 @@ async def validate_scenario(
     Returns:
         (scenario_id, validate_mode, reward)  — reward is None on error.
     """
-    label = f"{scenario_id} ({validate_mode})"
-    logger.info(f"Validating: {label}")
+    logger.info("Validating: %s (%s)", scenario_id, validate_mode)
 
-    env = Environment("coding")
-    env.connect_image(image)
+    env = _environment_for(image)
 
     try:
         task = env(scenario_id, validate_mode=validate_mode, hints_enabled=hints_enabled)
@@ -171,7 +218,7 @@ async def validate_scenario(
             await agent.run(ctx, max_steps=0)
         reward = ctx.reward
     except Exception as exc:
-        logger.error(f"Validation error for {label}: {exc}")
+        logger.error("Validation error for %s (%s): %s", scenario_id, validate_mode, exc)
         return (scenario_id, validate_mode, None)
 
     return (scenario_id, validate_mode, reward)
@@ -182,37 +229,60 @@ async def validate_all(
     scenario_ids: list[str],
     *,
     hints_enabled: bool = False,
+    fail_fast: bool = False,
+    concurrency: int = DEFAULT_VALIDATE_CONCURRENCY,
 ) -> tuple[list[str], list[str]]:
     """Validate all scenarios with both ``baseline_fail`` and ``golden_pass`` modes.
 
-    Both modes are expected to yield ``reward == 1.0``.
+    Both modes are expected to yield ``reward == 1.0``. Each result is
+    logged as soon as it completes.
+
+    Args:
+        fail_fast: Cancel the remaining validations after the first failure.
+        concurrency: Maximum number of validations (containers) running at once; must be at least 1.
 
     Returns:
         (passed_descriptions, failed_descriptions)
     """
-    coros = [
-        validate_scenario(image, sid, mode, hints_enabled=hints_enabled)
+    if concurrency < 1:
+        raise ValueError(f"concurrency must be at least 1, got {concurrency}")
+    sem = asyncio.Semaphore(concurrency)
+
+    async def guarded(sid: str, mode: str) -> tuple[str, str, float | None]:
+        async with sem:
+            return await validate_scenario(image, sid, mode, hints_enabled=hints_enabled)
+
+    tasks = [
+        asyncio.create_task(guarded(sid, mode), name=f"validate:{sid}:{mode}")
         for sid in scenario_ids
         for mode in VALIDATE_MODES
     ]
-    results = await asyncio.gather(*coros, return_exceptions=True)
 
     passed: list[str] = []
     failed: list[str] = []
 
-    for result in results:
-        if isinstance(result, BaseException):
-            failed.append(f"Exception: {result}")
-            continue
-
-        sid, mode, reward = result
-        desc = f"{sid} ({mode})"
-        if reward == 1.0:
-            logger.info(f"  PASS: {desc} -> reward={reward}")
-            passed.append(desc)
-        else:
-            logger.error(f"  FAIL: {desc} -> reward={reward} (expected 1.0)")
-            failed.append(desc)
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            try:
+                sid, mode, reward = await next_done
+            except Exception as exc:
+                failed.append(f"Exception: {exc}")
+            else:
+                desc = f"{sid} ({mode})"
+                if reward == 1.0:
+                    logger.info("  PASS: %s -> reward=%s", desc, reward)
+                    passed.append(desc)
+                else:
+                    logger.error("  FAIL: %s -> reward=%s (expected 1.0)", desc, reward)
+                    failed.append(desc)
+
+            if fail_fast and failed:
+                logger.error("Stopping validation after the first failure (--fail-fast)")
+                break
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
 
     return passed, failed
 
@@ -221,6 +291,8 @@ async def validate_all(
 # Run
 # ============================================================================
 
+DEFAULT_RUN_CONCURRENCY = 8
+
 
 async def run_scenario(
     image: str,
@@ -234,10 +306,9 @@ async def run_scenario(
     Returns:
         (scenario_id, reward)  — reward is None on error.
     """
-    logger.info(f"Running scenario: {scenario_id} (max_steps={max_steps}, hints={hints_enabled})")
+    logger.info("Running scenario: %s (max_steps=%d, hints=%s)", scenario_id, max_steps, hints_enabled)
 
-    env = Environment("coding")
-    env.connect_image(image)
+    env = _environment_for(image)
 
     try:
         task = env(scenario_id, hints_enabled=hints_enabled)
@@ -246,7 +317,7 @@ async def run_scenario(
             await agent.run(ctx, max_steps=max_steps)
         reward = ctx.reward
     except Exception as exc:
-        logger.error(f"Run error for {scenario_id}: {exc}")
+        logger.error("Run error for %s: %s", scenario_id, exc)
         return (scenario_id, None)
 
     return (scenario_id, reward)
@@ -258,29 +329,42 @@ async def run_all(
     max_steps: int,
     *,
     hints_enabled: bool = False,
+    concurrency: int = DEFAULT_RUN_CONCURRENCY,
 ) -> tuple[list[tuple[str, float]], list[tuple[str, float | None]]]:
-    """Run all scenarios concurrently with an agent.
+    """Run all scenarios concurrently with an agent, logging each result as it completes.
+
+    Args:
+        concurrency: Maximum number of scenarios (containers + agents) running at once; must be at least 1.
 
     Returns:
         (succeeded, failed)  — each entry is (scenario_id, reward).
     """
-    coros = [run_scenario(image, sid, max_steps, hints_enabled=hints_enabled) for sid in scenario_ids]
-    results = await asyncio.gather(*coros, return_exceptions=True)
+    if concurrency < 1:
+        raise ValueError(f"concurrency must be at least 1, got {concurrency}")
+    sem = asyncio.Semaphore(concurrency)
+
+    async def guarded(sid: str) -> tuple[str, float | None]:
+        async with sem:
+            return await run_scenario(image, sid, max_steps, hints_enabled=hints_enabled)
+
+    tasks = [asyncio.create_task(guarded(sid), name=f"run:{sid}") for sid in scenario_ids]
 
     succeeded: list[tuple[str, float]] = []
     failed: list[tuple[str, float | None]] = []
 
-    for result in results:
-        if isinstance(result, BaseException):
-            failed.append((f"Exception: {result}", None))
+    # Log each scenario as it finishes rather than after the slowest one.
+    for next_done in asyncio.as_completed(tasks):
+        try:
+            sid, reward = await next_done
+        except Exception as exc:
+            failed.append((f"Exception: {exc}", None))
             continue
 
-        sid, reward = result
         if reward is not None and reward > 0:
-            logger.info(f"  {sid} -> reward={reward}")
+            logger.info("  %s -> reward=%s", sid, reward)
             succeeded.append((sid, reward))
         else:
-            logger.error(f"  {sid} -> reward={reward}")
+            logger.error("  %s -> reward=%s", sid, reward)
             failed.append((sid, reward))
 
     return succeeded, failed
@@ -292,10 +376,27 @@ async def run_all(
 
 
 def _write_json(data: list[dict], path: str) -> None:
-    """Write a JSON list to *path* with trailing newline."""
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2)
-        f.write("\n")
+    """Write a JSON list to *path* with trailing newline.
+
+    The file is replaced atomically, and left untouched (mtime included)
+    when its content would not change.
+    """
+    if orjson is not None:
+        payload = orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE)
+    else:
+        payload = (json.dumps(data, indent=2, ensure_ascii=False) + "\n").encode("utf-8")
+
+    target = Path(path)
+    try:
+        if target.read_bytes() == payload:
+            logger.debug("%s is up to date", path)
+            return
+    except FileNotFoundError:
+        pass
+
+    tmp = target.with_name(f"{target.name}.tmp")
+    tmp.write_bytes(payload)
+    os.replace(tmp, target)
 
 
 def generate_json(
@@ -311,6 +412,8 @@ def generate_json(
     - ``remote_tasks.json`` uses the deployed environment name (no image field)
       and is consumed by ``hud eval remote_tasks.json``.
     """
+    # Entries share these dicts; they are only read during serialization.
+    env_ref = {"name": env_name}
     scenario_args: dict = {}
     if hints_enabled:
         scenario_args["hints_enabled"] = True
@@ -318,27 +421,27 @@ def generate_json(
     # -- problem-metadata.json (includes image) --
     problem_metadata = [
         {
-            "env": {"name": env_name},
+            "env": env_ref,
             "scenario": f"coding:{sid}",
             "image": image,
-            "args": {**scenario_args},
+            "args": scenario_args,
         }
         for sid in scenario_ids
     ]
     _write_json(problem_metadata, "problem-metadata.json")
-    logger.info(f"Generated problem-metadata.json with {len(problem_metadata)} scenario(s)")
+    logger.info("Generated problem-metadata.json with %d scenario(s)", len(problem_metadata))
 
     # -- remote_tasks.json (no image, used by hud eval) --
     remote_tasks = [
         {
-            "env": {"name": env_name},
+            "env": env_ref,
             "scenario": f"coding:{sid}",
-            "args": {**scenario_args},
+            "args": scenario_args,
         }
         for sid in scenario_ids
     ]
     _write_json(remote_tasks, "remote_tasks.json")
-    logger.info(f"Generated remote_tasks.json with {len(remote_tasks)} scenario(s)")
+    logger.info("Generated remote_tasks.json with %d scenario(s)", len(remote_tasks))
 
 
 # ============================================================================
@@ -346,14 +449,28 @@ def generate_json(
 # ============================================================================
 
 
+def _positive_int(value: str) -> int:
+    """Parse *value* as an integer >= 1 (an argparse ``type``)."""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid integer: {value!r}") from None
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
+
 async def async_main(args: argparse.Namespace) -> int:
-    """Execute the requested actions in order: build -> validate -> run -> push -> json."""
+    """Execute the requested actions: build first, then validate / run / push / json.
+
+    The post-build phases run concurrently; ``--sequential`` runs them in that order.
+    """
     # Resolve image name: CLI arg > [tool.hud].image in pyproject.toml
     image: str | None = args.image
     if not image:
         image = read_image_from_pyproject()
         if image:
-            logger.info(f"Using image from pyproject.toml [tool.hud]: {image}")
+            logger.info("Using image from pyproject.toml [tool.hud]: %s", image)
         else:
             logger.error(
                 "No image specified and could not read [tool.hud].image "
@@ -365,10 +482,15 @@ async def async_main(args: argparse.Namespace) -> int:
             return 1
 
     hints_enabled: bool = args.hints
-    has_failures = False
 
-    # Resolve scenario IDs: use --ids if given, otherwise auto-discover all.
-    scenario_ids: list[str] = args.ids or []
+    # Resolve scenario IDs: use --ids / --ids-file if given, otherwise auto-discover all.
+    scenario_ids: list[str] = list(args.ids or [])
+    if args.ids_file:
+        scenario_ids += read_ids_file(args.ids_file)
+    unique_ids = list(dict.fromkeys(scenario_ids))
+    if len(unique_ids) < len(scenario_ids):
+        logger.warning("Ignoring %d duplicate scenario ID(s)", len(scenario_ids) - len(unique_ids))
+        scenario_ids = unique_ids
     needs_scenarios = args.validate or args.run or args.json
     if not scenario_ids and needs_scenarios:
         scenario_ids = discover_scenario_ids()
@@ -385,63 +507,83 @@ async def async_main(args: argparse.Namespace) -> int:
         if not ok:
             return 1
 
+    # The remaining phases only depend on the image, so they run concurrently
+    # unless --sequential is given. Each returns True on success.
+
     # --- Validate ---
-    if args.validate:
-        logger.info(
-            f"Validating {len(scenario_ids)} scenario(s) "
-            f"× {len(VALIDATE_MODES)} modes ..."
-        )
+    async def validate_phase() -> bool:
+        logger.info("Validating %d scenario(s) × %d modes ...", len(scenario_ids), len(VALIDATE_MODES))
         passed, failed = await validate_all(
-            image, scenario_ids, hints_enabled=hints_enabled,
+            image,
+            scenario_ids,
+            hints_enabled=hints_enabled,
+            fail_fast=args.fail_fast,
+            concurrency=args.validate_concurrency,
         )
 
         logger.info("")
         logger.info("Validation summary:")
         if passed:
-            logger.info(f"  Passed ({len(passed)}): {', '.join(passed)}")
+            logger.info("  Passed (%d): %s", len(passed), ", ".join(passed))
         if failed:
-            logger.error(f"  Failed ({len(failed)}): {', '.join(failed)}")
-            has_failures = True
+            logger.error("  Failed (%d): %s", len(failed), ", ".join(failed))
+        return not failed
 
     # --- Run ---
-    if args.run:
-        logger.info(
-            f"Running {len(scenario_ids)} scenario(s) "
-            f"(max_steps={args.max_steps}) ..."
-        )
+    async def run_phase() -> bool:
+        logger.info("Running %d scenario(s) (max_steps=%d) ...", len(scenario_ids), args.max_steps)
         succeeded, failed_runs = await run_all(
-            image, scenario_ids, args.max_steps, hints_enabled=hints_enabled,
+            image, scenario_ids, args.max_steps, hints_enabled=hints_enabled, concurrency=args.run_concurrency,
         )
 
         logger.info("")
         logger.info("Run summary:")
         if succeeded:
-            logger.info(f"  Succeeded ({len(succeeded)}):")
-            for sid, reward in succeeded:
-                logger.info(f"    {sid}: reward={reward}")
+            logger.info(
+                "  Succeeded (%d):\n%s",
+                len(succeeded),
+                "\n".join(f"    {sid}: reward={reward}" for sid, reward in succeeded),
+            )
         if failed_runs:
-            logger.error(f"  Failed ({len(failed_runs)}):")
-            for sid, reward in failed_runs:
-                logger.error(f"    {sid}: reward={reward}")
-            has_failures = True
+            logger.error(
+                "  Failed (%d):\n%s",
+                len(failed_runs),
+                "\n".join(f"    {sid}: reward={reward}" for sid, reward in failed_runs),
+            )
+        return not failed_runs
 
     # --- Push ---
-    if args.push:
+    async def push_phase() -> bool:
         if not _looks_like_registry_image(image):
             logger.warning(
-                f"Image name '{image}' does not contain a registry prefix "
-                f"(e.g. 'myregistry.io/org/image:tag'). "
-                f"Pushing a local-only name will likely fail."
+                "Image name '%s' does not contain a registry prefix "
+                "(e.g. 'myregistry.io/org/image:tag'). "
+                "Pushing a local-only name will likely fail.",
+                image,
             )
-        ok = await push_image(image)
-        if not ok:
-            has_failures = True
+        return await push_image(image)
 
     # --- JSON ---
-    if args.json:
+    async def json_phase() -> bool:
         generate_json(image, scenario_ids, hints_enabled=hints_enabled)
+        return True
+
+    phases = [
+        phase
+        for enabled, phase in (
+            (args.validate, validate_phase),
+            (args.run, run_phase),
+            (args.push, push_phase),
+            (args.json, json_phase),
+        )
+        if enabled
+    ]
+    if args.sequential:
+        results = [await phase() for phase in phases]
+    else:
+        results = await asyncio.gather(*(phase() for phase in phases))
 
-    return 1 if has_failures else 0
+    return 0 if all(results) else 1
 
 
 def main(argv: Iterable[str] | None = None) -> int:
@@ -466,6 +608,11 @@ def main(argv: Iterable[str] | None = None) -> int:
         nargs="+",
         help="Scenario IDs to validate / run (default: all registered scenarios)",
     )
+    parser.add_argument(
+        "--ids-file",
+        metavar="PATH",
+        help="File with one scenario ID per line, or - for stdin (combined with --ids)",
+    )
 
     # Action flags --------------------------------------------------------
     parser.add_argument(
@@ -506,14 +653,45 @@ def main(argv: Iterable[str] | None = None) -> int:
         default=False,
         help="Enable hints for scenarios (passed as hints_enabled to scenarios, included in JSON args)",
     )
+    parser.add_argument(
+        "--fail-fast",
+        action="store_true",
+        default=False,
+        help="Stop validation at the first failing scenario",
+    )
+    parser.add_argument(
+        "--validate-concurrency",
+        type=_positive_int,
+        default=None,
+        help=(
+            "Max validations run at once for --validate "
+            f"(default: $VALIDATE_CONCURRENCY or {DEFAULT_VALIDATE_CONCURRENCY})"
+        ),
+    )
     parser.add_argument(
         "--max-steps",
         type=int,
         default=20,
         help="Max agent steps for --run (default: 20)",
     )
+    parser.add_argument(
+        "--run-concurrency",
+        type=_positive_int,
+        default=None,
+        help=f"Max scenarios run at once for --run (default: $RUN_CONCURRENCY or {DEFAULT_RUN_CONCURRENCY})",
+    )
+    parser.add_argument(
+        "--sequential",
+        action="store_true",
+        default=False,
+        help=(
+            "Run the post-build phases one at a time (validate -> run -> push -> json); "
+            "otherwise -v and -r overlap and their concurrency limits add up"
+        ),
+    )
 
-    args = parser.parse_args(list(argv) if argv is not None else None)
+    # parse_args copies any iterable itself; no need to materialize it here.
+    args = parser.parse_args(argv)
 
     if not any([args.build, args.push, args.validate, args.run, args.json]):
         logger.warning(
@@ -521,6 +699,17 @@ def main(argv: Iterable[str] | None = None) -> int:
         )
         return 0
 
+    # Concurrency flags fall back to their env var, read only for the phases requested.
+    for wanted, dest, env_var, default in (
+        (args.validate, "validate_concurrency", "VALIDATE_CONCURRENCY", DEFAULT_VALIDATE_CONCURRENCY),
+        (args.run, "run_concurrency", "RUN_CONCURRENCY", DEFAULT_RUN_CONCURRENCY),
+    ):
+        if wanted and getattr(args, dest) is None:
+            try:
+                setattr(args, dest, _positive_int(os.environ.get(env_var, str(default))))
+            except argparse.ArgumentTypeError as exc:
+                parser.error(f"{env_var}: {exc}")
+
     return asyncio.run(async_main(args))
 
 
@@ -9,6 +9,7 @@ Development workflow:
 
 import asyncio
 import os
+import re
 
 import hud
 from hud import Environment
@@ -31,6 +32,23 @@ DEV_URL = os.getenv("HUD_DEV_URL", "http://localhost:8765/mcp")
 #env.connect_url(DEV_URL)
 env.connect_image("coding-template")
 
+_PASSED_RE = re.compile(r"\bpassed\b", re.IGNORECASE)
+_FAILED_RE = re.compile(r"\b(?:failed|errors?)\b", re.IGNORECASE)
+
+
+def _extract_text(result) -> str:
+    """Join the text content blocks of a tool call result."""
+    return "\n".join(t for t in (getattr(b, "text", None) for b in result.content) if t is not None)
+
+
+def _pytest_summary(output: str) -> str | None:
+    """Return pytest's final "=== 3 passed in 0.12s ===" line, or None if absent."""
+    for line in reversed(output[-2048:].splitlines()):
+        line = line.strip()
+        if line.startswith("=") and line.endswith("=") and " in " in line:
+            return line
+    return None
+
 
 async def test_tools_standalone():
     """Test environment tools directly (no scenario)."""
@@ -38,9 +56,8 @@ async def test_tools_standalone():
     print(f"Connecting to: {DEV_URL}")
 
     async with env:
-        tools = env.as_tools()
-        visible_tools = [t for t in tools if not t.name.startswith("_")]
-        print(f"Agent-visible tools: {[t.name for t in visible_tools]}")
+        visible_tools = [t.name for t in env.as_tools() if not t.name.startswith("_")]
+        print(f"Agent-visible tools: {visible_tools}")
 
         result = await env.call_tool("bash", command="echo 'Hello from coding env'")
         print(f"Bash result: {result}")
@@ -89,11 +106,13 @@ async def validate_golden(
         test_cmd = f"cd /home/ubuntu/project && python -m pytest {' '.join(test_files)} -v"
         print(f"Running: {test_cmd}")
         result = await env.call_tool("bash", command=test_cmd)
-        print(result)
-        from time import sleep
-        sleep(1000)
-        # Check result
-        if "passed" in result.lower() and "failed" not in result.lower():
+        output = _extract_text(result)
+        print(output)
+        # Check result (only pytest's summary line, not the whole log)
+        summary = _pytest_summary(output)
+        if summary is None:
+            print("\n⚠️  No pytest summary line found - tests may have crashed, check the output above")
+        elif _PASSED_RE.search(summary) and not _FAILED_RE.search(summary):
             print("\n✅ Golden branch PASSES tests")
         else:
             print("\n❌ Golden branch FAILS tests - check your setup!")
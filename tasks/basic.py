@@ -11,7 +11,7 @@ from grading import AgentPatchGrader, Grade, ValidateMode
 async def sample_json_bug(hints_enabled: bool = False, validate_mode: ValidateMode | None = None):
     """Fix the JSON serialization bug in server.py."""
     
-    setup_task(
+    await setup_task(
         task_id="sample_json_bug",
         base="server_fix_baseline",
         test="server_fix_test",
@@ -30,7 +30,7 @@ instead of proper JSON (e.g., single quotes instead of double quotes).
     
     # Grade using AgentPatchGrader
     grade = Grade.from_subscores([
-        AgentPatchGrader.grade(
+        await AgentPatchGrader.grade(
             weight=1.0,
             problem_id="sample_json_bug",
             test_files=["test_server.py"],
@@ -50,7 +50,7 @@ instead of proper JSON (e.g., single quotes instead of double quotes).
 # async def my_task(hints_enabled: bool = False, validate_mode: ValidateMode | None = None):
 #     """Task description."""
 #     
-#     setup_task(
+#     await setup_task(
 #         task_id="my_task",
 #         base="my_task_baseline",
 #         test="my_task_test",
@@ -62,7 +62,7 @@ instead of proper JSON (e.g., single quotes instead of double quotes).
 #     _ = yield prompt
 #     
 #     grade = Grade.from_subscores([
-#         AgentPatchGrader.grade(
+#         await AgentPatchGrader.grade(
 #             weight=1.0,
 #             problem_id="my_task",
 #             test_files=["test_foo.py"],
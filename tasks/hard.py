@@ -21,7 +21,7 @@ Each task is a scenario that handles its own setup and grading.
 # async def my_hard_task(hints_enabled: bool = False, validate_mode: ValidateMode | None = None):
 #     """Implement complex feature Y with architectural changes."""
 #     
-#     setup_task(
+#     await setup_task(
 #         task_id="my_hard_task",
 #         base="my_hard_task_baseline",
 #         test="my_hard_task_test",
@@ -38,7 +38,7 @@ Each task is a scenario that handles its own setup and grading.
 #     _ = yield prompt
 #     
 #     grade = Grade.from_subscores([
-#         AgentPatchGrader.grade(
+#         await AgentPatchGrader.grade(
 #             weight=1.0,
 #             problem_id="my_hard_task",
 #             test_files=["test_feature_y.py", "test_integration.py"],
@@ -21,7 +21,7 @@ Each task is a scenario that handles its own setup and grading.
 # async def my_medium_task(hints_enabled: bool = False, validate_mode: ValidateMode | None = None):
 #     """Implement feature X across multiple components."""
 #     
-#     setup_task(
+#     await setup_task(
 #         task_id="my_medium_task",
 #         base="my_medium_task_baseline",
 #         test="my_medium_task_test",
@@ -38,7 +38,7 @@ Each task is a scenario that handles its own setup and grading.
 #     _ = yield prompt
 #     
 #     grade = Grade.from_subscores([
-#         AgentPatchGrader.grade(
+#         await AgentPatchGrader.grade(
 #             weight=1.0,
 #             problem_id="my_medium_task",
 #             test_files=["test_feature_x.py"],
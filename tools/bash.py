@@ -1,5 +1,6 @@
 import asyncio  # noqa -- swapping to trio would be beneficial, but not blocking atm
 import os
+import shlex
 import tempfile
 
 from .base import CLIResult, ToolError, ToolResult
@@ -16,9 +17,10 @@ class _BashSession:
     _timeout: float = 120.0  # seconds (1 minute)
     _sentinel: str = "<<exit>>"
 
-    def __init__(self):
+    def __init__(self, cwd: str | None = None):
         self._started = False
         self._timed_out = False
+        self._cwd = cwd
 
     async def start(self):
         if self._started:
@@ -34,6 +36,7 @@ class _BashSession:
         self._process = await asyncio.create_subprocess_shell(
             self.command,
             preexec_fn=demote,
+            cwd=self._cwd,
             shell=True,
             bufsize=0,
             stdin=asyncio.subprocess.PIPE,
@@ -143,23 +146,49 @@ class BashTool:
 
     _session: _BashSession | None
 
-    def __init__(self):
+    def __init__(self, cwd: str | None = None):
+        """
+        Initialize the BashTool.
+
+        Args:
+            cwd: Directory the shell starts in (default: the server's working directory).
+        """
         self._session = None
+        self._cwd = cwd
 
     async def __call__(self, command: str | None = None, restart: bool = False, **kwargs) -> ToolResult:
         if restart:
             if self._session:
                 self._session.stop()
-            self._session = _BashSession()
+            self._session = _BashSession(cwd=self._cwd)
             await self._session.start()
 
             return ToolResult(system="tool has been restarted.")
 
         if self._session is None:
-            self._session = _BashSession()
+            self._session = _BashSession(cwd=self._cwd)
             await self._session.start()
 
         if command is not None:
             return await self._session.run(command)
 
-        raise ToolError("no command provided.")
\ No newline at end of file
+        raise ToolError("no command provided.")
+
+    async def reset(self, cwd: str | None = None) -> None:
+        """Return an existing session to *cwd* (default: the tool's cwd).
+
+        A live shell is reused by sending it a ``cd``, which is much cheaper than
+        restarting bash. A session that has exited or timed out is dropped and a
+        fresh one is started on next use. If no directory is known, the shell is
+        left where it is.
+        """
+        session = self._session
+        if session is None:
+            return
+        if session._process.returncode is not None or session._timed_out:
+            session.stop()
+            self._session = None
+            return
+        target = cwd or self._cwd
+        if target is not None:
+            await session.run(f"cd {shlex.quote(target)}")
@@ -1,6 +1,7 @@
 """Utility to run shell commands asynchronously with a timeout."""
 import asyncio
 import os
+import signal
 
 TRUNCATED_MESSAGE: str = "<response clipped><NOTE>To save on context only part of this file has been shown to you. You should retry this tool after you have searched inside the file with `grep -n` in order to find the line numbers of what you are looking for.</NOTE>"
 MAX_RESPONSE_LEN: int = 16000
@@ -48,6 +49,8 @@ async def run(
         stdout=asyncio.subprocess.PIPE,
         stderr=asyncio.subprocess.PIPE,
         preexec_fn=preexec_fn,
+        # Own process group, so a timeout also kills anything the shell spawned.
+        start_new_session=True,
     )
 
     try:
@@ -59,9 +62,10 @@ async def run(
         )
     except TimeoutError as exc:
         try:
-            process.kill()
+            os.killpg(process.pid, signal.SIGKILL)
         except ProcessLookupError:
             pass
+        await process.wait()
         raise TimeoutError(
             f"Command '{cmd}' timed out after {timeout} seconds"
         ) from exc